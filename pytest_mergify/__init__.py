@@ -22,9 +22,21 @@ from pytest_mergify import flaky_detection as _flaky_detection
 from pytest_mergify import utils
 from pytest_mergify.ci_insights import MergifyCIInsights
 
+# A failure's report can run to megabytes: a huge assertion diff, a dumped
+# payload. Past this, only the end is kept, since that is where pytest puts the
+# failing line and the error.
+MAX_STACKTRACE_LENGTH = 64 * 1024
+
 
 class PytestMergify:
     mergify_ci: MergifyCIInsights
+    # Read by every per-test hook, so it is copied off `mergify_ci` once rather
+    # than looked up through it each time.
+    tracer: typing.Optional[opentelemetry.trace.Tracer] = None
+    # The span of the test being run, kept at hand for the report hooks. The
+    # current span is whatever the test last left in the context, which is not
+    # necessarily ours when the code under test is itself instrumented.
+    test_span: typing.Optional[opentelemetry.trace.Span] = None
 
     def pytest_configure(self, config: _pytest.config.Config) -> None:
         config.addinivalue_line(
@@ -37,6 +49,7 @@ class PytestMergify:
         if api_url is not None:
             kwargs["api_url"] = api_url
         self.mergify_ci = MergifyCIInsights(**kwargs)
+        self.tracer = self.mergify_ci.tracer
 
         self._xdist_controller = _flaky_detection.XdistFlakyDetectionController()
 
@@ -156,19 +169,39 @@ class PytestMergify:
                 red=True,
             )
         else:
+            export_error = False
             try:
                 exported = self.mergify_ci.tracer_provider.force_flush()
             except Exception as e:
+                exported = False
+                export_error = True
                 terminalreporter.write_line(
                     f"Error while exporting traces: {e}",
                     red=True,
                 )
-            else:
-                if exported:
+
+            # Spans go up in batches, so a failed upload may still have
+            # delivered part of the run: its id is then still worth printing.
+            flush = self.mergify_ci.last_flush
+            if exported or (flush is not None and flush.exported > 0):
+                terminalreporter.write_line(
+                    f"MERGIFY_TEST_RUN_ID={self.mergify_ci.test_run_id}",
+                )
+
+            if not exported:
+                if flush is not None and flush.timed_out:
+                    terminalreporter.write_line(
+                        "Uploading the test results to Mergify timed out; "
+                        f"{flush.queued - flush.exported} of {flush.queued} spans may be lost",
+                        yellow=True,
+                    )
+                elif flush is not None and flush.exported > 0:
                     terminalreporter.write_line(
-                        f"MERGIFY_TEST_RUN_ID={self.mergify_ci.test_run_id}",
+                        f"Mergify's API only accepted {flush.exported} of {flush.queued} spans; "
+                        "the uploaded test results are incomplete",
+                        red=True,
                     )
-                else:
+                elif not export_error:
                     terminalreporter.write_line(
                         "Mergify's API did not accept the test results after retrying; they were not uploaded",
                         red=True,
@@ -182,10 +215,6 @@ class PytestMergify:
                     red=True,
                 )
 
-    @property
-    def tracer(self) -> typing.Optional[opentelemetry.trace.Tracer]:
-        return self.mergify_ci.tracer
-
     def pytest_sessionstart(self, session: _pytest.main.Session) -> None:
         if self.tracer:
             traceparent = os.environ.get("MERGIFY_TRACEPARENT")
@@ -201,6 +230,11 @@ class PytestMergify:
                 },
                 context=ctx if traceparent else None,
             )
+            # Every test span is parented on the session span; the context
+            # carrying it never changes, so it is built once here.
+            self._session_context = opentelemetry.trace.set_span_in_context(
+                self.session_span
+            )
         self.has_error = False
 
     @pytest.hookimpl(trylast=True)
@@ -248,7 +282,11 @@ class PytestMergify:
         self, item: _pytest.nodes.Item
     ) -> typing.Dict[str, typing.Any]:
         filepath, line_number, testname = item.location
-        namespace = testname.replace(item.name, "")
+        # Only the trailing name is the test's own: a class or module whose name
+        # contains it (`Testtest.test`) must come through untouched.
+        namespace = (
+            testname[: -len(item.name)] if testname.endswith(item.name) else testname
+        )
         if namespace.endswith("."):
             namespace = namespace[:-1]
 
@@ -257,7 +295,11 @@ class PytestMergify:
             SpanAttributes.CODE_FUNCTION: item.name,
             SpanAttributes.CODE_LINENO: line_number or 0,
             SpanAttributes.CODE_NAMESPACE: namespace,
-            "code.file.path": str(_pytest.pathlib.absolutepath(item.reportinfo()[0])),
+            # `item.location` is `reportinfo()` made relative to the rootdir and
+            # cached on the item; joining it back avoids a second `reportinfo()`.
+            "code.file.path": str(
+                _pytest.pathlib.absolutepath(item.config.rootpath / filepath)
+            ),
             "code.line.number": line_number or 0,
             "test.scope": "case",
         }
@@ -300,12 +342,16 @@ class PytestMergify:
 
         with self.tracer.start_as_current_span(
             name=item.nodeid,
-            context=opentelemetry.trace.set_span_in_context(self.session_span),
+            context=self._session_context,
             attributes=self._get_item_attributes(item),
         ) as current_span:
-            distinct_outcomes, rerun_count = self._execute_test_with_reruns(
-                item, nextitem
-            )
+            self.test_span = current_span
+            try:
+                distinct_outcomes, rerun_count = self._execute_test_with_reruns(
+                    item, nextitem
+                )
+            finally:
+                self.test_span = None
 
             if rerun_count > 0:
                 if "failed" in distinct_outcomes and "passed" in distinct_outcomes:
@@ -450,21 +496,27 @@ class PytestMergify:
             return
 
         excinfo = call.excinfo
+        test_span = self.test_span
 
-        if excinfo is not None:
-            test_span = opentelemetry.trace.get_current_span()
+        if excinfo is not None and test_span is not None:
+            # Rendered once: an exception's `__str__` is user code and can be
+            # as slow as it likes.
+            message = str(excinfo.value)
+            stacktrace = str(report.longrepr)
+            if len(stacktrace) > MAX_STACKTRACE_LENGTH:
+                stacktrace = "[truncated]\n" + stacktrace[-MAX_STACKTRACE_LENGTH:]
 
             test_span.set_attributes(
                 {
-                    SpanAttributes.EXCEPTION_TYPE: str(excinfo.type.__name__),
-                    SpanAttributes.EXCEPTION_MESSAGE: str(excinfo.value),
-                    SpanAttributes.EXCEPTION_STACKTRACE: str(report.longrepr),
+                    SpanAttributes.EXCEPTION_TYPE: excinfo.type.__name__,
+                    SpanAttributes.EXCEPTION_MESSAGE: message,
+                    SpanAttributes.EXCEPTION_STACKTRACE: stacktrace,
                 }
             )
             test_span.set_status(
                 opentelemetry.trace.Status(
                     status_code=opentelemetry.trace.StatusCode.ERROR,
-                    description=f"{excinfo.type}: {excinfo.value}",
+                    description=f"{excinfo.type}: {message}",
                 )
             )
 
@@ -498,9 +550,13 @@ class PytestMergify:
             if has_error
             else opentelemetry.trace.StatusCode.OK
         )
-        self.has_error |= has_error
+        if has_error:
+            self.has_error = True
+
+        test_span = self.test_span
+        if test_span is None:
+            return
 
-        test_span = opentelemetry.trace.get_current_span()
         test_span.set_status(status_code)
         test_span.set_attributes(
             {
@@ -1,15 +1,14 @@
+import concurrent.futures
 import dataclasses
+import functools
 import os
-import random
+import secrets
+import time
 import typing
 
 import _pytest.nodes
 import opentelemetry.sdk.resources
 import requests
-from opentelemetry.exporter.otlp.proto.http import Compression
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
-    OTLPSpanExporter,
-)
 from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider, export
 from opentelemetry.semconv._incubating.attributes import cicd_attributes, vcs_attributes
 
@@ -26,25 +25,76 @@ import pytest_mergify.resources.pytest as resources_pytest
 from pytest_mergify import flaky_detection, utils
 
 
+@dataclasses.dataclass
+class FlushOutcome:
+    """What the last flush of a `SynchronousBatchSpanProcessor` got through."""
+
+    queued: int = 0
+    exported: int = 0
+    timed_out: bool = False
+    "The deadline passed before every batch was sent; the rest was given up."
+
+
 class SynchronousBatchSpanProcessor(export.SimpleSpanProcessor):
-    def __init__(self, exporter: export.SpanExporter) -> None:
+    """
+    Queue every span and export them all when flushed.
+
+    Not a `BatchSpanProcessor`: its bounded queue drops spans once full, which
+    here means test results silently missing from a large run, and its worker
+    thread logs export errors instead of raising them, so the terminal summary
+    could no longer tell why an upload failed. Ending a span only appends to a
+    list; the network is touched once, at the end of the session.
+    """
+
+    def __init__(
+        self,
+        exporter: export.SpanExporter,
+        max_export_batch_size: int = 512,
+    ) -> None:
         super().__init__(exporter)
         self.queue: typing.List[ReadableSpan] = []
+        self.max_export_batch_size = max_export_batch_size
+        # `force_flush` can only answer with a bool, which cannot tell a
+        # timeout from a refusal: the details are kept here for the summary.
+        self.last_flush: typing.Optional[FlushOutcome] = None
 
     def force_flush(self, timeout_millis: int = 30_000) -> bool:
         if not self.queue:
             return True
 
-        try:
-            exported = self.span_exporter.export(self.queue)
-        finally:
-            # Cleared even when the export raises, so a batch is attempted once.
-            # `shutdown` flushes too, and the SDK keeps its atexit hook armed
-            # until that returns, so a queue left behind is sent twice more and
-            # the last failure surfaces as an ignored exception at exit.
-            self.queue.clear()
-
-        return exported is export.SpanExportResult.SUCCESS
+        # Taken off the processor before exporting, so a batch is attempted
+        # once even when the export raises. `shutdown` flushes too, and the SDK
+        # keeps its atexit hook armed until that returns, so a queue left behind
+        # is sent twice more and the last failure surfaces as an ignored
+        # exception at exit.
+        queue, self.queue = self.queue, []
+        self.last_flush = outcome = FlushOutcome(queued=len(queue))
+
+        deadline = time.monotonic() + timeout_millis / 1000
+        exported = True
+        # A large suite queues tens of thousands of spans. Sent as one request,
+        # the body alone can outlast the exporter's timeout and lose the whole
+        # run; in batches, each request stays small enough to go through, and
+        # a batch the exporter fails on only costs itself. A client error
+        # raised by `SessionRaisingOnPermanentError` ends the flush instead:
+        # every later batch would be refused the same way. `last_flush` keeps
+        # what went through before either.
+        for start in range(0, len(queue), self.max_export_batch_size):
+            # The exporter retries on its own, so a slow API can hold each
+            # batch for a while. Past the deadline the rest is given up rather
+            # than keeping the job waiting at the very end.
+            if time.monotonic() >= deadline:
+                outcome.timed_out = True
+                return False
+
+            batch = queue[start : start + self.max_export_batch_size]
+            result = self.span_exporter.export(batch)
+            if result is export.SpanExportResult.SUCCESS:
+                outcome.exported += len(batch)
+            else:
+                exported = False
+
+        return exported
 
     def on_end(self, span: ReadableSpan) -> None:
         if not span.context.trace_flags.sampled:
@@ -83,9 +133,9 @@ class MergifyCIInsights:
     token: typing.Optional[str] = dataclasses.field(
         default_factory=lambda: os.environ.get("MERGIFY_TOKEN")
     )
-    repo_name: typing.Optional[str] = dataclasses.field(
-        default_factory=utils.get_repository_name
-    )
+    # Resolved in `__post_init__`, and only in CI: finding it may shell out to
+    # `git`, which a local run has no use for.
+    repo_name: typing.Optional[str] = None
     api_url: str = dataclasses.field(
         default_factory=lambda: os.environ.get(
             "MERGIFY_API_URL", "https://api.mergify.com"
@@ -104,9 +154,12 @@ class MergifyCIInsights:
     tracer_provider: typing.Optional[opentelemetry.sdk.trace.TracerProvider] = (
         dataclasses.field(init=False, default=None)
     )
+    span_processor: typing.Optional[SpanProcessor] = dataclasses.field(
+        init=False, default=None
+    )
     test_run_id: str = dataclasses.field(
         init=False,
-        default_factory=lambda: random.getrandbits(64).to_bytes(8, "big").hex(),
+        default_factory=lambda: secrets.token_hex(8),
     )
 
     flaky_detector: typing.Optional[flaky_detection.FlakyDetector] = dataclasses.field(
@@ -136,6 +189,9 @@ class MergifyCIInsights:
         if not utils.is_in_ci():
             return
 
+        if self.repo_name is None:
+            self.repo_name = utils.get_repository_name()
+
         span_processor: SpanProcessor
 
         if utils.is_env_true("PYTEST_MERGIFY_DEBUG"):
@@ -153,6 +209,15 @@ class MergifyCIInsights:
                 owner, repo = utils.split_full_repo_name(self.repo_name)
             except utils.InvalidRepositoryFullNameError:
                 return
+
+            # Imported here, like the in-memory exporter above: it pulls in
+            # protobuf and the generated OTLP messages, which a run that
+            # uploads nothing -- any local one -- should not pay for.
+            from opentelemetry.exporter.otlp.proto.http import Compression
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+
             self.exporter = OTLPSpanExporter(
                 session=SessionRaisingOnPermanentError(),
                 endpoint=f"{self.api_url}/v1/ci/{owner}/repositories/{repo}/traces",
@@ -163,6 +228,10 @@ class MergifyCIInsights:
         else:
             return
 
+        # Order matters: a later resource overrides an earlier one only where
+        # it has a value. The git detector comes first, so the CI detectors
+        # fall back to its answers without spawning the same git subprocesses
+        # again.
         resource = opentelemetry.sdk.resources.get_aggregated_resources(
             [
                 resources_git.GitResourceDetector(),
@@ -186,6 +255,7 @@ class MergifyCIInsights:
 
         self.tracer_provider = TracerProvider(resource=resource)
 
+        self.span_processor = span_processor
         self.tracer_provider.add_span_processor(span_processor)
         self.tracer = self.tracer_provider.get_tracer("pytest-mergify")
 
@@ -199,15 +269,49 @@ class MergifyCIInsights:
             # `str` cast just for `mypy`.
             self.branch_name = str(branch_name)
 
-        self._load_flaky_detector(
-            # A base branch indicates a PR context. Use `new` mode for PRs to
-            # detect newly flaky tests, `unhealthy` for push/scheduled runs to
-            # focus on known problematic tests.
-            mode="new"
-            if resource.attributes.get(vcs_attributes.VCS_REF_BASE_NAME)
-            else "unhealthy",
-        )
+        loaders: typing.List[typing.Callable[[], None]] = [
+            functools.partial(
+                self._load_flaky_detector,
+                # A base branch indicates a PR context. Use `new` mode for PRs
+                # to detect newly flaky tests, `unhealthy` for push/scheduled
+                # runs to focus on known problematic tests.
+                mode="new"
+                if resource.attributes.get(vcs_attributes.VCS_REF_BASE_NAME)
+                else "unhealthy",
+            ),
+            self._load_quarantine,
+            functools.partial(self._load_test_selection, resource),
+        ]
+        # Without credentials no lookup calls the API, and on xdist workers
+        # only the quarantine one does: no thread is worth starting then.
+        if (
+            self.token is None
+            or self.repo_name is None
+            or os.environ.get("PYTEST_XDIST_WORKER") is not None
+        ):
+            for load in loaders:
+                load()
+            return
 
+        # The lookups are independent API calls, each setting its own
+        # attribute and handling its own errors: run them side by side so
+        # startup waits for the slowest one instead of their sum.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(loaders)
+        ) as executor:
+            futures = [executor.submit(load) for load in loaders]
+        for future in futures:
+            future.result()
+
+    @property
+    def last_flush(self) -> typing.Optional[FlushOutcome]:
+        """What the last upload of the test results got through, when known."""
+        if isinstance(self.span_processor, SynchronousBatchSpanProcessor):
+            return self.span_processor.last_flush
+
+        return None
+
+    def _load_quarantine(self) -> None:
         if self.token and self.repo_name and self.branch_name:
             self.quarantined_tests = pytest_mergify.quarantine.Quarantine(
                 self.api_url,
@@ -216,8 +320,6 @@ class MergifyCIInsights:
                 self.branch_name,
             )
 
-        self._load_test_selection(resource)
-
     def _load_test_selection(
         self, resource: opentelemetry.sdk.resources.Resource
     ) -> None:
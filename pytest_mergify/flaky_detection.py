@@ -8,7 +8,6 @@ import _pytest
 import _pytest.main
 import _pytest.nodes
 import _pytest.reports
-import requests
 
 from pytest_mergify import utils
 
@@ -145,13 +144,21 @@ class FlakyDetector:
     _over_length_tests: typing.Set[str] = dataclasses.field(
         init=False, default_factory=set
     )
+    "Over-length tests that actually ran here, hence reported by this process."
+
+    _over_length_tests_in_session: typing.Set[str] = dataclasses.field(
+        init=False, default_factory=set
+    )
+    """Over-length tests of the whole collection. Every xdist worker collects
+    all of them, so this is never reported as is."""
 
     _available_budget_duration: datetime.timedelta = dataclasses.field(
         init=False, default_factory=datetime.timedelta
     )
-    _tests_to_process: typing.List[str] = dataclasses.field(
-        init=False, default_factory=list
+    _tests_to_process: typing.Set[str] = dataclasses.field(
+        init=False, default_factory=set
     )
+    "Checked on every report of every test, hence a set."
 
     _suspended_item_finalizers: typing.Dict[_pytest.nodes.Node, typing.Any] = (
         dataclasses.field(
@@ -187,6 +194,13 @@ class FlakyDetector:
 
     _is_xdist: bool = dataclasses.field(init=False, default=False)
 
+    _debug: bool = dataclasses.field(
+        init=False,
+        default_factory=lambda: utils.is_env_true("PYTEST_MERGIFY_DEBUG"),
+    )
+    """Debug logs are only shown with `PYTEST_MERGIFY_DEBUG`, so skip building
+    them otherwise: some are emitted for every rerun of every test."""
+
     def __post_init__(self) -> None:
         self._context = self._fetch_context()
 
@@ -205,11 +219,13 @@ class FlakyDetector:
         instance._context = _FlakyDetectionContext(**context_dict)
         instance._test_metrics = {}
         instance._over_length_tests = set()
+        instance._over_length_tests_in_session = set()
         instance._available_budget_duration = datetime.timedelta()
-        instance._tests_to_process = []
+        instance._tests_to_process = set()
         instance._suspended_item_finalizers = {}
         instance._debug_logs = []
         instance._is_xdist = True
+        instance._debug = utils.is_env_true("PYTEST_MERGIFY_DEBUG")
         return instance
 
     def _fetch_context(self) -> _FlakyDetectionContext:
@@ -217,7 +233,7 @@ class FlakyDetector:
             self.full_repository_name,
         )
 
-        response = requests.get(
+        response = utils.api_session().get(
             url=f"{self.url}/v1/ci/{owner}/repositories/{repository_name}/flaky-detection-context",
             headers={"Authorization": f"Bearer {self.token}"},
             timeout=10,
@@ -254,11 +270,11 @@ class FlakyDetector:
             self._test_metrics.pop(test, None)
             return
 
-        if test not in self._tests_to_process:
+        if test in self._over_length_tests_in_session:
+            self._over_length_tests.add(test)
             return
 
-        if len(test) > self._context.max_test_name_length:
-            self._over_length_tests.add(test)
+        if test not in self._tests_to_process:
             return
 
         if test not in self._test_metrics:
@@ -273,29 +289,38 @@ class FlakyDetector:
 
     def prepare_for_session(self, session: _pytest.main.Session) -> None:
         tests_in_session = {item.nodeid for item in session.items}
-        existing_tests_in_session = [
-            test
-            for test in self._context.existing_test_names
-            if test in tests_in_session
-        ]
+        # The context keeps the names as the lists the API sent, which is also
+        # how they travel to xdist workers. Every lookup below is done against
+        # a set instead: on a large suite, scanning those lists once per test
+        # in the session is quadratic.
+        existing_tests_in_session = tests_in_session.intersection(
+            self._context.existing_test_names
+        )
 
         excluded_tests = {
             item.nodeid for item in session.items if _flaky_detection_disabled(item)
         }
 
         if self.mode == "new":
-            self._tests_to_process = [
-                test
-                for test in tests_in_session
-                if test not in existing_tests_in_session and test not in excluded_tests
-            ]
+            self._tests_to_process = (
+                tests_in_session - existing_tests_in_session - excluded_tests
+            )
         elif self.mode == "unhealthy":
-            self._tests_to_process = [
-                test
-                for test in tests_in_session
-                if test in self._context.unhealthy_test_names
-                and test not in excluded_tests
-            ]
+            self._tests_to_process = (
+                tests_in_session.intersection(self._context.unhealthy_test_names)
+                - excluded_tests
+            )
+
+        # A name over the limit is known from the collection already. Setting
+        # those tests aside now keeps them out of the budget split, and spares
+        # a length check on every report of every test. They are only listed
+        # as skipped once their reports show up, in the process running them.
+        self._over_length_tests_in_session = {
+            test
+            for test in self._tests_to_process
+            if len(test) > self._context.max_test_name_length
+        }
+        self._tests_to_process -= self._over_length_tests_in_session
 
         if self.mode == "new":
             budget_ratio = self._context.budget_ratio_for_new_tests
@@ -375,15 +400,13 @@ class FlakyDetector:
             metrics.rerun_count + 1 >= self._context.max_test_execution_count
         )
 
-        self._debug_logs.append(
-            utils.StructuredLog.make(
-                message="Check for last rerun",
-                test=test,
-                deadline=metrics.deadline.isoformat() if metrics.deadline else None,
-                rerun_count=metrics.rerun_count,
-                will_exceed_deadline=will_exceed_deadline,
-                will_exceed_rerun_count=will_exceed_rerun_count,
-            )
+        self._log_debug(
+            message="Check for last rerun",
+            test=test,
+            deadline=metrics.deadline.isoformat() if metrics.deadline else None,
+            rerun_count=metrics.rerun_count,
+            will_exceed_deadline=will_exceed_deadline,
+            will_exceed_rerun_count=will_exceed_rerun_count,
         )
 
         return will_exceed_deadline or will_exceed_rerun_count
@@ -403,41 +426,34 @@ class FlakyDetector:
         self, test: str, timeout: typing.Optional[datetime.timedelta] = None
     ) -> None:
         metrics = self._test_metrics[test]
+        now = datetime.datetime.now(datetime.timezone.utc)
 
         if self._is_xdist:
             # Static allocation: equal share of total budget per test.
             per_test_budget = self._available_budget_duration / max(
                 len(self._tests_to_process), 1
             )
-            metrics.deadline = (
-                datetime.datetime.now(datetime.timezone.utc) + per_test_budget
-            )
-            self._debug_logs.append(
-                utils.StructuredLog.make(
-                    message="Deadline set",
-                    test=test,
-                    available_budget=str(self._available_budget_duration),
-                    is_xdist=True,
-                    all_tests=len(self._tests_to_process),
-                )
+            metrics.deadline = now + per_test_budget
+            self._log_debug(
+                message="Deadline set",
+                test=test,
+                available_budget=str(self._available_budget_duration),
+                is_xdist=True,
+                all_tests=len(self._tests_to_process),
             )
         else:
             remaining_budget = self._get_remaining_budget_duration()
             remaining_tests = self._count_remaining_tests()
 
             # Distribute remaining budget equally across remaining tests.
-            metrics.deadline = datetime.datetime.now(datetime.timezone.utc) + (
-                remaining_budget / remaining_tests
-            )
-            self._debug_logs.append(
-                utils.StructuredLog.make(
-                    message="Deadline set",
-                    test=test,
-                    available_budget=str(self._available_budget_duration),
-                    remaining_budget=str(remaining_budget),
-                    all_tests=len(self._tests_to_process),
-                    remaining_tests=remaining_tests,
-                )
+            metrics.deadline = now + remaining_budget / remaining_tests
+            self._log_debug(
+                message="Deadline set",
+                test=test,
+                available_budget=str(self._available_budget_duration),
+                remaining_budget=str(remaining_budget),
+                all_tests=len(self._tests_to_process),
+                remaining_tests=remaining_tests,
             )
 
         if not timeout:
@@ -446,18 +462,16 @@ class FlakyDetector:
         # Leave a margin of 10 %. Better safe than sorry. We don't want to crash
         # the CI.
         safe_timeout = timeout * 0.9
-        timeout_deadline = datetime.datetime.now(datetime.timezone.utc) + safe_timeout
+        timeout_deadline = now + safe_timeout
         if not metrics.deadline or timeout_deadline < metrics.deadline:
             metrics.deadline = timeout_deadline
             metrics.prevented_timeout = True
-            self._debug_logs.append(
-                utils.StructuredLog.make(
-                    message="Deadline updated to prevent timeout",
-                    test=test,
-                    timeout=str(timeout),
-                    safe_timeout=str(safe_timeout),
-                    deadline=metrics.deadline.isoformat() if metrics.deadline else None,
-                )
+            self._log_debug(
+                message="Deadline updated to prevent timeout",
+                test=test,
+                timeout=str(timeout),
+                safe_timeout=str(safe_timeout),
+                deadline=metrics.deadline.isoformat() if metrics.deadline else None,
             )
 
     def suspend_item_finalizers(self, item: _pytest.nodes.Item) -> None:
@@ -467,18 +481,15 @@ class FlakyDetector:
         See: https://github.com/pytest-dev/pytest-rerunfailures/blob/master/src/pytest_rerunfailures.py#L532-L538
         """
 
-        if item not in item.session._setupstate.stack:
+        stack = item.session._setupstate.stack
+        if item not in stack:
             return
 
-        for stacked_item in list(item.session._setupstate.stack.keys()):
-            if stacked_item == item:
-                continue
-
-            if stacked_item not in self._suspended_item_finalizers:
-                self._suspended_item_finalizers[stacked_item] = (
-                    item.session._setupstate.stack[stacked_item]
-                )
-            del item.session._setupstate.stack[stacked_item]
+        # Collected first: the stack cannot shrink while being iterated.
+        for stacked_item in [node for node in stack if node is not item]:
+            self._suspended_item_finalizers.setdefault(
+                stacked_item, stack.pop(stacked_item)
+            )
 
     def restore_item_finalizers(self, item: _pytest.nodes.Item) -> None:
         """
@@ -521,12 +532,16 @@ class FlakyDetector:
             ],
         }
 
+    def _log_debug(self, message: str, **kwargs: typing.Any) -> None:
+        if self._debug:
+            self._debug_logs.append(utils.StructuredLog.make(message, **kwargs))
+
     def _count_remaining_tests(self) -> int:
-        already_processed_tests = {
-            test for test, metrics in self._test_metrics.items() if metrics.deadline
-        }
+        already_processed_tests = sum(
+            1 for metrics in self._test_metrics.values() if metrics.deadline
+        )
 
-        return max(len(self._tests_to_process) - len(already_processed_tests), 1)
+        return max(len(self._tests_to_process) - already_processed_tests, 1)
 
     def _get_used_budget_duration(self) -> datetime.timedelta:
         return sum(
@@ -620,57 +635,57 @@ def make_report_from_aggregated(
     over_length_tests = aggregated_metrics["over_length_tests"]
     debug_logs = aggregated_metrics["debug_logs"]
 
-    result = "🐛 Flaky detection"
+    lines = ["🐛 Flaky detection"]
 
     if over_length_tests:
-        result += (
-            f"{os.linesep}- Skipped {len(over_length_tests)} "
+        lines.append(
+            f"- Skipped {len(over_length_tests)} "
             f"test{'s' if len(over_length_tests) > 1 else ''}:"
         )
         for test in sorted(over_length_tests):
-            result += (
-                f"{os.linesep}    • '{test}' has not been tested multiple times because the name of the test "
+            lines.append(
+                f"    • '{test}' has not been tested multiple times because the name of the test "
                 f"exceeds our limit of {context.max_test_name_length} characters"
             )
 
     if not test_metrics:
-        result += f"{os.linesep}- No {mode} tests detected, but we are watching 👀"
-        return result
+        lines.append(f"- No {mode} tests detected, but we are watching 👀")
+        return os.linesep.join(lines)
 
     available_budget_seconds = available_budget_duration_ms / 1000
     used_budget_ms = sum(m["rerun_duration_ms"] for m in test_metrics.values())
     used_budget_seconds = used_budget_ms / 1000
     if available_budget_seconds > 0:
-        result += (
-            f"{os.linesep}- Used {used_budget_seconds / available_budget_seconds * 100:.2f} % of the budget "
+        lines.append(
+            f"- Used {used_budget_seconds / available_budget_seconds * 100:.2f} % of the budget "
             f"({used_budget_seconds:.2f} s/{available_budget_seconds:.2f} s)"
         )
     else:
-        result += f"{os.linesep}- Used {used_budget_seconds:.2f} s (budget unavailable)"
+        lines.append(f"- Used {used_budget_seconds:.2f} s (budget unavailable)")
 
-    result += (
-        f"{os.linesep}- Active for {len(test_metrics)} {mode} "
+    lines.append(
+        f"- Active for {len(test_metrics)} {mode} "
         f"test{'s' if len(test_metrics) > 1 else ''}:"
     )
     for test, m in sorted(test_metrics.items()):
         if m["rerun_count"] < context.min_test_execution_count:
-            result += (
-                f"{os.linesep}    • '{test}' is too slow to be tested at least "
+            lines.append(
+                f"    • '{test}' is too slow to be tested at least "
                 f"{context.min_test_execution_count} times within the budget"
             )
             continue
 
         rerun_duration_seconds = m["rerun_duration_ms"] / 1000
         if available_budget_seconds > 0:
-            result += (
-                f"{os.linesep}    • '{test}' has been tested {m['rerun_count']} "
+            lines.append(
+                f"    • '{test}' has been tested {m['rerun_count']} "
                 f"time{'s' if m['rerun_count'] > 1 else ''} using approx. "
                 f"{rerun_duration_seconds / available_budget_seconds * 100:.2f} % of the budget "
                 f"({rerun_duration_seconds:.2f} s/{available_budget_seconds:.2f} s)"
             )
         else:
-            result += (
-                f"{os.linesep}    • '{test}' has been tested {m['rerun_count']} "
+            lines.append(
+                f"    • '{test}' has been tested {m['rerun_count']} "
                 f"time{'s' if m['rerun_count'] > 1 else ''} "
                 f"({rerun_duration_seconds:.2f} s)"
             )
@@ -679,24 +694,23 @@ def make_report_from_aggregated(
         test for test, m in test_metrics.items() if m["prevented_timeout"]
     )
     if tests_prevented_from_timeout:
-        result += (
-            f"{os.linesep}⚠️ Reduced reruns for the following "
+        lines.append(
+            f"⚠️ Reduced reruns for the following "
             f"test{'s' if len(tests_prevented_from_timeout) > 1 else ''} to respect 'pytest-timeout':"
         )
         for test in tests_prevented_from_timeout:
-            result += f"{os.linesep}    • '{test}'"
+            lines.append(f"    • '{test}'")
 
-        result += (
-            f"{os.linesep}To improve flaky detection and prevent fixture-level timeouts from limiting reruns, enable function-only timeouts. "
-            f"Reference: https://github.com/pytest-dev/pytest-timeout?tab=readme-ov-file#avoiding-timeouts-in-fixtures"
+        lines.append(
+            "To improve flaky detection and prevent fixture-level timeouts from limiting reruns, enable function-only timeouts. "
+            "Reference: https://github.com/pytest-dev/pytest-timeout?tab=readme-ov-file#avoiding-timeouts-in-fixtures"
         )
 
     if utils.is_env_true("PYTEST_MERGIFY_DEBUG") and debug_logs:
-        result += f"{os.linesep}🔎 Debug Logs"
-        for log in debug_logs:
-            result += f"{os.linesep}{json.dumps(log)}"
+        lines.append("🔎 Debug Logs")
+        lines.extend(json.dumps(log) for log in debug_logs)
 
-    return result
+    return os.linesep.join(lines)
 
 
 def _flaky_detection_disabled(item: _pytest.nodes.Item) -> bool:
@@ -5,6 +5,8 @@ import _pytest.nodes
 import requests
 import typing
 
+from pytest_mergify import utils
+
 
 @dataclasses.dataclass
 class Quarantine:
@@ -18,6 +20,10 @@ class Quarantine:
     quarantine_used_by_tests: typing.Set[str] = dataclasses.field(
         init=False, default_factory=set
     )
+    _quarantined_test_names: typing.Set[str] = dataclasses.field(
+        init=False, default_factory=set
+    )
+    "Same names as `quarantined_tests`, looked up for every collected test."
     init_error_msg: typing.Optional[str] = dataclasses.field(init=False, default=None)
 
     def __post_init__(self) -> None:
@@ -50,7 +56,7 @@ class Quarantine:
             seen_urls.add(url)
 
             try:
-                quarantine_resp: requests.Response = requests.get(
+                quarantine_resp: requests.Response = utils.api_session().get(
                     url,
                     headers=headers,
                     params=params,
@@ -98,9 +104,10 @@ class Quarantine:
             params = None
 
         self.quarantined_tests = quarantined_tests
+        self._quarantined_test_names = set(quarantined_tests)
 
     def __contains__(self, item: _pytest.nodes.Item) -> bool:
-        return item.nodeid in self.quarantined_tests
+        return item.nodeid in self._quarantined_test_names
 
     def quarantined_tests_report(self) -> str:
         report_str = f"""🛡️ Quarantine
@@ -116,7 +123,7 @@ class Quarantine:
 """
 
         unused_quarantined_tests = (
-            set(self.quarantined_tests) - self.quarantine_used_by_tests
+            self._quarantined_test_names - self.quarantine_used_by_tests
         )
         if unused_quarantined_tests:
             report_str += f"""
@@ -5,7 +5,6 @@ from opentelemetry.sdk.resources import Resource, ResourceDetector
 from opentelemetry.semconv._incubating.attributes import cicd_attributes, vcs_attributes
 
 from pytest_mergify import utils
-from pytest_mergify.resources import git
 
 GIT_BRANCH_PREFIXES = ("origin/", "refs/heads/")
 
@@ -45,9 +44,5 @@ class JenkinsResourceDetector(ResourceDetector):
         if utils.get_ci_provider() != "jenkins":
             return Resource({})
 
-        attributes = utils.get_attributes(
-            git.GitResourceDetector.OPENTELEMETRY_GIT_MAPPING
-        )
-        attributes.update(utils.get_attributes(self.OPENTELEMETRY_JENKINS_MAPPING))
-
-        return Resource(attributes)
+        # No git fallback here: see the detector order in `MergifyCIInsights`.
+        return Resource(utils.get_attributes(self.OPENTELEMETRY_JENKINS_MAPPING))
@@ -5,6 +5,8 @@ import _pytest.config
 import _pytest.nodes
 import requests
 
+from pytest_mergify import utils
+
 
 @dataclasses.dataclass
 class TestSelection:
@@ -44,7 +46,7 @@ class TestSelection:
             return
 
         try:
-            response = requests.get(
+            response = utils.api_session().get(
                 f"{self.api_url}/v1/ci/{owner}/repositories/{repository}/test-selection",
                 headers={"Authorization": f"Bearer {self.token}"},
                 params={
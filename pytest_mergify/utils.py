@@ -4,8 +4,12 @@ import json
 import os
 import re
 import subprocess
+import threading
 import typing
 
+import requests
+import requests.adapters
+
 CIProviderT = typing.Literal[
     "github_actions", "circleci", "pytest_mergify_suite", "jenkins", "buildkite"
 ]
@@ -18,6 +22,49 @@ SUPPORTED_CIs: typing.Dict[str, CIProviderT] = {
     "_PYTEST_MERGIFY_TEST": "pytest_mergify_suite",
 }
 
+# Mergify's API is called at startup by the quarantine, flaky detection and
+# test selection lookups, which run side by side. A `requests.Session` is not
+# guaranteed to be thread-safe, so each thread gets its own. The lookups thus
+# do not share a connection, each one opens its own; only the calls made from
+# one thread reuse it, e.g. to walk the quarantine's paginated results.
+#
+# A gateway error is retried a couple of times on the spot rather than failing
+# the whole lookup. Only those are: a connection or read error is not retried,
+# so an API that hangs still costs a single request timeout at startup.
+_API_SESSIONS = threading.local()
+
+
+def _make_api_session() -> requests.Session:
+    session = requests.Session()
+    session.mount(
+        "https://",
+        requests.adapters.HTTPAdapter(
+            max_retries=requests.adapters.Retry(
+                total=None,
+                connect=0,
+                read=0,
+                other=0,
+                status=2,
+                backoff_factor=0.2,
+                # Honouring `Retry-After` would sleep for however long the API
+                # asks, with no upper bound, before pytest even starts.
+                respect_retry_after_header=False,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            )
+        ),
+    )
+    return session
+
+
+def api_session() -> requests.Session:
+    """The session for the calls the current thread makes to Mergify's API."""
+    session: typing.Optional[requests.Session] = getattr(_API_SESSIONS, "session", None)
+    if session is None:
+        session = _API_SESSIONS.session = _make_api_session()
+
+    return session
+
 
 @dataclasses.dataclass
 class StructuredLog:
@@ -83,19 +130,20 @@ def get_ci_provider() -> typing.Optional[CIProviderT]:
     return None
 
 
+# Handle SSH Git URLs like git@github.com:owner/repo.git
+_SSH_REPOSITORY_URL_RE = re.compile(
+    r"git@[\w.-]+:(?P<full_name>[\w.-]+/[\w.-]+)(?:\.git)?/?$"
+)
+# Handle HTTPS/HTTP URLs like https://github.com/owner/repo (with optional port)
+_HTTP_REPOSITORY_URL_RE = re.compile(
+    r"(https?://[\w.-]+(?::\d+)?/)?(?P<full_name>[\w.-]+/[\w.-]+)/?$"
+)
+
+
 def get_repository_name_from_url(repository_url: str) -> typing.Optional[str]:
-    match = (
-        # Handle SSH Git URLs like git@github.com:owner/repo.git
-        re.match(
-            r"git@[\w.-]+:(?P<full_name>[\w.-]+/[\w.-]+)(?:\.git)?/?$",
-            repository_url,
-        )
-        # Handle HTTPS/HTTP URLs like https://github.com/owner/repo (with optional port)
-        or re.match(
-            r"(https?://[\w.-]+(?::\d+)?/)?(?P<full_name>[\w.-]+/[\w.-]+)/?$",
-            repository_url,
-        )
-    )
+    match = _SSH_REPOSITORY_URL_RE.match(repository_url)
+    if match is None:
+        match = _HTTP_REPOSITORY_URL_RE.match(repository_url)
     if match is None:
         return None
 
@@ -157,10 +205,12 @@ def get_repository_name() -> typing.Optional[str]:
 
 
 def strtobool(string: str) -> bool:
-    if string.lower() in {"y", "yes", "t", "true", "on", "1"}:
+    value = string.lower()
+
+    if value in {"y", "yes", "t", "true", "on", "1"}:
         return True
 
-    if string.lower() in {"n", "no", "f", "false", "off", "0"}:
+    if value in {"n", "no", "f", "false", "off", "0"}:
         return False
 
     raise ValueError(f"Could not convert '{string}' to boolean")
@@ -36,6 +36,15 @@ def set_api_url(
     monkeypatch.setenv("MERGIFY_API_URL", "http://localhost:9999")
 
 
+@pytest.fixture(autouse=True)
+def unset_xdist_worker_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    # When this suite itself runs under `pytest -n`, xdist sets these in every
+    # worker, and the sessions the tests start in-process would take themselves
+    # for xdist workers too.
+    for env in ("PYTEST_XDIST_WORKER", "PYTEST_XDIST_WORKER_COUNT"):
+        monkeypatch.delenv(env, raising=False)
+
+
 PytesterWithSpanReturnT = typing.Tuple[
     _pytest.pytester.RunResult, typing.Optional[typing.Dict[str, trace.ReadableSpan]]
 ]
@@ -134,6 +143,13 @@ def pytester_with_spans(
     return _run
 
 
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    # The plugin queries its API endpoints concurrently at startup, so serve
+    # requests in parallel, as the real API does.
+    allow_reuse_address = True
+    daemon_threads = True
+
+
 class TestHTTPRequestHandler(http.server.BaseHTTPRequestHandler):
     # Class attribute for the response code, set by the fixture.
     response_code: int = 200
@@ -201,9 +217,7 @@ class UploadedBatch:
         return span
 
 
-class _OTLPServer(socketserver.TCPServer):
-    allow_reuse_address = True
-
+class _OTLPServer(_ThreadingServer):
     def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
         self.bodies: typing.List[bytes] = []
         super().__init__(*args, **kwargs)
@@ -297,7 +311,7 @@ def http_server(request: pytest.FixtureRequest) -> typing.Generator[str, None, N
     response_code = getattr(request, "param", 200)
     TestHTTPRequestHandler.response_code = response_code
 
-    with socketserver.TCPServer(("", 0), TestHTTPRequestHandler) as httpd:
+    with _ThreadingServer(("", 0), TestHTTPRequestHandler) as httpd:
         host, port = httpd.server_address  # retrieve the actual port
         thread = threading.Thread(target=httpd.serve_forever)
         thread.daemon = True
@@ -57,6 +57,38 @@ def test_flushing_an_empty_queue_reports_success() -> None:
     assert processor.force_flush() is True
 
 
+def test_a_large_queue_is_exported_in_batches() -> None:
+    batch_sizes = []
+
+    class _CountingSpanExporter(export.SpanExporter):
+        def export(self, spans: typing.Any) -> export.SpanExportResult:
+            batch_sizes.append(len(spans))
+            return export.SpanExportResult.SUCCESS
+
+    processor = ci_insights.SynchronousBatchSpanProcessor(
+        _CountingSpanExporter(), max_export_batch_size=2
+    )
+    for _ in range(5):
+        _record_one_span(processor)
+
+    assert processor.force_flush() is True
+    assert batch_sizes == [2, 2, 1]
+
+
+def test_flushing_past_the_timeout_gives_up_on_the_remaining_batches() -> None:
+    exporter = InMemorySpanExporter()
+    processor = ci_insights.SynchronousBatchSpanProcessor(exporter)
+    _record_one_span(processor)
+
+    assert processor.force_flush(timeout_millis=0) is False
+    assert exporter.get_finished_spans() == ()
+    assert processor.last_flush == ci_insights.FlushOutcome(
+        queued=1, exported=0, timed_out=True
+    )
+    # Given up, not kept around for `shutdown` to send at exit.
+    assert processor.force_flush() is True
+
+
 def test_a_batch_the_exporter_rejects_is_attempted_once() -> None:
     # `shutdown` flushes as well, and the SDK leaves its atexit hook armed until
     # that returns, so a batch left in the queue is sent three times over and
@@ -78,6 +110,29 @@ def test_a_batch_the_exporter_rejects_is_attempted_once() -> None:
     assert attempts == [1]
 
 
+def test_flushing_keeps_what_went_through_before_an_error() -> None:
+    results = iter([export.SpanExportResult.SUCCESS, export.SpanExportResult.FAILURE])
+
+    class _FlakySpanExporter(export.SpanExporter):
+        def export(self, spans: typing.Any) -> export.SpanExportResult:
+            result = next(results, None)
+            if result is None:
+                raise RuntimeError("the API rejected the batch")
+            return result
+
+    processor = ci_insights.SynchronousBatchSpanProcessor(
+        _FlakySpanExporter(), max_export_batch_size=2
+    )
+    for _ in range(7):
+        _record_one_span(processor)
+
+    with pytest.raises(RuntimeError):
+        processor.force_flush()
+
+    # The failed batch did not stop the flush, the error did.
+    assert processor.last_flush == ci_insights.FlushOutcome(queued=7, exported=2)
+
+
 @pytest.mark.parametrize(
     argnames="status",
     argvalues=[
@@ -150,10 +205,10 @@ def _make_quarantine_mock() -> None:
 def _make_flaky_detection_context_mock(
     budget_ratio_for_new_tests: float = 0.1,
     budget_ratio_for_unhealthy_tests: float = 0.05,
-    existing_test_names: typing.List[str] = [],
+    existing_test_names: typing.Optional[typing.List[str]] = None,
     existing_tests_mean_duration_ms: int = 0,
-    unhealthy_test_names: typing.List[str] = [],
-    max_test_execution_count: int = 1000,
+    unhealthy_test_names: typing.Optional[typing.List[str]] = None,
+    max_test_execution_count: int = 20,
     max_test_name_length: int = 65536,
     min_budget_duration_ms: int = 4000,
     min_test_execution_count: int = 5,
@@ -165,9 +220,9 @@ def _make_flaky_detection_context_mock(
         json={
             "budget_ratio_for_new_tests": budget_ratio_for_new_tests,
             "budget_ratio_for_unhealthy_tests": budget_ratio_for_unhealthy_tests,
-            "existing_test_names": existing_test_names,
+            "existing_test_names": existing_test_names or [],
             "existing_tests_mean_duration_ms": existing_tests_mean_duration_ms,
-            "unhealthy_test_names": unhealthy_test_names,
+            "unhealthy_test_names": unhealthy_test_names or [],
             "max_test_execution_count": max_test_execution_count,
             "max_test_name_length": max_test_name_length,
             "min_budget_duration_ms": min_budget_duration_ms,
@@ -296,7 +351,7 @@ def test_flaky_detection_for_new_tests(
 
     result.assert_outcomes(
         failed=1,  # Only the first execution of the flaky test.
-        passed=3001,  # 2 tests run once + 2 new tests pass 1000x + flaky test passes 999x (first execution fails).
+        passed=61,  # 2 tests run once + 2 new tests pass 20x + flaky test passes 19x (first execution fails).
         skipped=1,  # The skipped test is tested only once because skipped tests are excluded from the flaky detection.
     )
 
@@ -316,14 +371,14 @@ def test_flaky_detection_for_new_tests(
     assert spans is not None
     assert len(spans) == 1 + 6  # 1 for the session and one per test.
 
-    flaky_tests = [
+    flaky_tests = {
         "test_flaky_detection_for_new_tests.py::test_bar",
-    ]
-    new_tests = [
+    }
+    new_tests = {
         "test_flaky_detection_for_new_tests.py::test_bar",
         "test_flaky_detection_for_new_tests.py::test_baz",
         "test_flaky_detection_for_new_tests.py::test_corge",
-    ]
+    }
     for span in spans.values():
         assert span is not None
         assert span.attributes is not None
@@ -334,7 +389,7 @@ def test_flaky_detection_for_new_tests(
         if span.name in new_tests:
             assert span.attributes.get("cicd.test.flaky_detection", False) is True
             assert span.attributes.get("cicd.test.new", False) is True
-            assert span.attributes.get("cicd.test.rerun_count", 0) == 999
+            assert span.attributes.get("cicd.test.rerun_count", 0) == 19
 
 
 @responses.activate
@@ -389,7 +444,7 @@ def test_flaky_detection_for_unhealthy_tests(
     outcomes = result.parseoutcomes()
     assert outcomes["passed"] == 4  # Initial run of each test.
     assert outcomes["skipped"] == 1
-    assert outcomes["rerun"] == 2997  # 999 reruns for each unhealthy test.
+    assert outcomes["rerun"] == 57  # 19 reruns for each unhealthy test.
 
     assert re.search(
         r"""🐛 Flaky detection
@@ -405,12 +460,12 @@ def test_flaky_detection_for_unhealthy_tests(
     assert spans is not None
     assert len(spans) == 5 + 1  # 1 for the session and one per test.
 
-    flaky_tests = ["test_flaky_detection_for_unhealthy_tests.py::test_bar"]
-    unhealthy_tests = [
+    flaky_tests = {"test_flaky_detection_for_unhealthy_tests.py::test_bar"}
+    unhealthy_tests = {
         "test_flaky_detection_for_unhealthy_tests.py::test_bar",
         "test_flaky_detection_for_unhealthy_tests.py::test_baz",
         "test_flaky_detection_for_unhealthy_tests.py::test_quux",
-    ]
+    }
     for span in spans.values():
         assert span is not None
         assert span.attributes is not None
@@ -421,7 +476,7 @@ def test_flaky_detection_for_unhealthy_tests(
         if span.name in unhealthy_tests:
             assert not span.attributes.get("cicd.test.new")
             assert span.attributes.get("cicd.test.flaky_detection", False) is True
-            assert span.attributes.get("cicd.test.rerun_count", 0) == 999
+            assert span.attributes.get("cicd.test.rerun_count", 0) == 19
             # The status should reflect the initial run outcome, not "rerun"
             assert span.attributes.get("test.case.result.status") == "passed"
 
@@ -509,23 +564,23 @@ def test_flaky_detection_with_fixtures(
         def test_last():
             # This test validates that fixtures are properly set up and torn down
             # during test reruns. With 3 tests total (test_first, test_second, test_last)
-            # where test_second is new and runs 1000 times in total:
-            # - SETUP_COUNT should be 1002 (1 initial run per test + 999 reruns of test_second)
-            # - TEARDOWN_COUNT should be 1001 (all tests complete except test_last which is currently running)
+            # where test_second is new and runs 20 times in total:
+            # - SETUP_COUNT should be 22 (1 initial run per test + 19 reruns of test_second)
+            # - TEARDOWN_COUNT should be 21 (all tests complete except test_last which is currently running)
             # This ensures that function-scoped fixtures execute fresh for each rerun,
             # while session-scoped fixtures run only once (validated by SESSION_ALREADY_SET).
             global SETUP_COUNT, TEARDOWN_COUNT
-            assert SETUP_COUNT == 1002
-            assert TEARDOWN_COUNT == 1001  # Teardown hasn't run yet for test_last.
+            assert SETUP_COUNT == 22
+            assert TEARDOWN_COUNT == 21  # Teardown hasn't run yet for test_last.
         """
     )
 
     result.assert_outcomes(
-        passed=1002,  # 1000 executions for the new test, plus 2 tests run once.
+        passed=22,  # 20 executions for the new test, plus 2 tests run once.
     )
 
     # We should only suspend and restore finalized for the tracked test.
-    assert len(suspended_calls) == 999
+    assert len(suspended_calls) == 19
     assert all(
         call == "test_flaky_detection_with_fixtures.py::test_second"
         for call in suspended_calls
@@ -567,7 +622,7 @@ def test_flaky_detection_with_only_one_new_test_at_the_end(
             assert True
         """
     )
-    result.assert_outcomes(passed=1001)
+    result.assert_outcomes(passed=21)
 
     assert spans is not None
     assert len(spans) == 1 + 2  # 1 for the session and one per test.
@@ -579,7 +634,7 @@ def test_flaky_detection_with_only_one_new_test_at_the_end(
     assert span.attributes is not None
     assert span.attributes.get("cicd.test.flaky_detection", False) is True
     assert span.attributes.get("cicd.test.new", False) is True
-    assert span.attributes.get("cicd.test.rerun_count", 0) == 999
+    assert span.attributes.get("cicd.test.rerun_count", 0) == 19
 
 
 @responses.activate
@@ -773,17 +828,18 @@ def test_flaky_detection_slow_test_not_reran(
     result = pytester.runpytest_inprocess(
         plugins=[CustomPlugin(), pytest_mergify.PytestMergify()]
     )
-    result.assert_outcomes(passed=1002)
+    result.assert_outcomes(passed=22)
+    stdout = result.stdout.str()
 
     # `test_fast` should have been tested successfully.
     assert re.search(
         r"'test_flaky_detection_slow_test_not_reran\.py::test_fast' has been tested \d+ times",
-        result.stdout.str(),
+        stdout,
     )
 
     assert (
         "'test_flaky_detection_slow_test_not_reran.py::test_slow' is too slow to be tested at least 5 times within the budget"
-        in result.stdout.str()
+        in stdout
     )
 
 
@@ -962,17 +1018,14 @@ def test_flaky_detection_budget_deadline_stops_reruns(
         ]
     )
 
+    plugin = pytest_mergify.PytestMergify()
+
     class CustomPlugin:
         deadline_patched: bool = False
         execution_count: int = 0
 
         def pytest_runtest_call(self, item: _pytest.nodes.Item) -> None:
-            plugin = None
-            for existing in item.session.config.pluginmanager.get_plugins():
-                if isinstance(existing, pytest_mergify.PytestMergify):
-                    plugin = existing
-
-            if not plugin or not plugin.mergify_ci.flaky_detector:
+            if not plugin.mergify_ci.flaky_detector:
                 return
 
             self.execution_count += 1
@@ -998,9 +1051,7 @@ def test_flaky_detection_budget_deadline_stops_reruns(
         """
     )
 
-    result = pytester.runpytest_inprocess(
-        plugins=[pytest_mergify.PytestMergify(), CustomPlugin()]
-    )
+    result = pytester.runpytest_inprocess(plugins=[plugin, CustomPlugin()])
 
     # We should have:
     # - 1 execution of `test_existing`,
@@ -1049,15 +1100,53 @@ def test_flaky_detector_prepare_for_session_in_new_mode(
     assert plugin.mergify_ci.flaky_detector is not None
 
     # Only the known new test should be in the tests to process.
-    assert plugin.mergify_ci.flaky_detector._tests_to_process == [
+    assert plugin.mergify_ci.flaky_detector._tests_to_process == {
         "test_flaky_detector_prepare_for_session_in_new_mode.py::test_bar"
-    ]
+    }
     assert (
         plugin.mergify_ci.flaky_detector._available_budget_duration.total_seconds()
         == datetime.timedelta(seconds=5).total_seconds()
     )
 
 
+@responses.activate
+def test_flaky_detector_prepare_for_session_sets_aside_over_length_tests(
+    monkeypatch: pytest.MonkeyPatch,
+    pytester: _pytest.pytester.Pytester,
+) -> None:
+    _set_test_environment(monkeypatch, mode="new")
+    _make_quarantine_mock()
+    _make_flaky_detection_context_mock(
+        existing_test_names=["baseline.py::test_baseline"],
+        max_test_execution_count=10,
+        max_test_name_length=100,
+    )
+
+    long_name = f"test_{'a' * 100}"
+    pytester.makepyfile(
+        f"""
+        def test_bar():
+            assert True
+
+        def {long_name}():
+            assert True
+        """
+    )
+
+    plugin = pytest_mergify.PytestMergify()
+
+    result = pytester.runpytest_inprocess(plugins=[plugin])
+    result.assert_outcomes(passed=11)  # The long-named test once, test_bar 10 times.
+
+    assert plugin.mergify_ci.flaky_detector is not None
+    assert plugin.mergify_ci.flaky_detector._tests_to_process == {
+        "test_flaky_detector_prepare_for_session_sets_aside_over_length_tests.py::test_bar"
+    }
+    assert plugin.mergify_ci.flaky_detector._over_length_tests == {
+        f"test_flaky_detector_prepare_for_session_sets_aside_over_length_tests.py::{long_name}"
+    }
+
+
 @responses.activate
 def test_flaky_detector_prepare_for_session_in_unhealthy_mode(
     monkeypatch: pytest.MonkeyPatch,
@@ -1098,9 +1187,9 @@ def test_flaky_detector_prepare_for_session_in_unhealthy_mode(
     assert plugin.mergify_ci.flaky_detector is not None
 
     # Only the known unhealthy test should be in the tests to process.
-    assert plugin.mergify_ci.flaky_detector._tests_to_process == [
+    assert plugin.mergify_ci.flaky_detector._tests_to_process == {
         "test_flaky_detector_prepare_for_session_in_unhealthy_mode.py::test_foo"
-    ]
+    }
     assert (
         plugin.mergify_ci.flaky_detector._available_budget_duration.total_seconds()
         == datetime.timedelta(seconds=5).total_seconds()
@@ -1165,8 +1254,8 @@ def test_flaky_detection_excludes_opted_out_tests(
     )
 
     result.assert_outcomes(
-        # test_watched: 1000 executions; test_excluded: 1 (not rerun).
-        passed=1001,
+        # test_watched: 20 executions; test_excluded: 1 (not rerun).
+        passed=21,
     )
 
     # Only test_watched is rerun; test_excluded is absent from the report.
@@ -1186,7 +1275,7 @@ def test_flaky_detection_excludes_opted_out_tests(
     assert watched.attributes is not None
     assert watched.attributes.get("cicd.test.new") is True
     assert watched.attributes.get("cicd.test.flaky_detection") is True
-    assert watched.attributes.get("cicd.test.rerun_count") == 999
+    assert watched.attributes.get("cicd.test.rerun_count") == 19
 
     excluded = spans["test_flaky_detection_excludes_opted_out_tests.py::test_excluded"]
     assert excluded.attributes is not None
@@ -29,11 +29,13 @@ class InitializedFlakyDetector(flaky_detection.FlakyDetector):
         self.mode = "new"
         self._test_metrics = {}
         self._over_length_tests = set()
+        self._over_length_tests_in_session = set()
         self._available_budget_duration = datetime.timedelta()
-        self._tests_to_process = []
+        self._tests_to_process = set()
         self._suspended_item_finalizers = {}
         self._debug_logs = []
         self._is_xdist = False
+        self._debug = False
 
     def __post_init__(self) -> None:
         pass
@@ -42,9 +44,9 @@ class InitializedFlakyDetector(flaky_detection.FlakyDetector):
 def _make_flaky_detection_context(
     budget_ratio_for_new_tests: float = 0,
     budget_ratio_for_unhealthy_tests: float = 0,
-    existing_test_names: typing.List[str] = [],
+    existing_test_names: typing.Optional[typing.List[str]] = None,
     existing_tests_mean_duration_ms: int = 0,
-    unhealthy_test_names: typing.List[str] = [],
+    unhealthy_test_names: typing.Optional[typing.List[str]] = None,
     max_test_execution_count: int = 0,
     max_test_name_length: int = 0,
     min_budget_duration_ms: int = 0,
@@ -53,9 +55,9 @@ def _make_flaky_detection_context(
     return flaky_detection._FlakyDetectionContext(
         budget_ratio_for_new_tests=budget_ratio_for_new_tests,
         budget_ratio_for_unhealthy_tests=budget_ratio_for_unhealthy_tests,
-        existing_test_names=existing_test_names,
+        existing_test_names=existing_test_names or [],
         existing_tests_mean_duration_ms=existing_tests_mean_duration_ms,
-        unhealthy_test_names=unhealthy_test_names,
+        unhealthy_test_names=unhealthy_test_names or [],
         max_test_execution_count=max_test_execution_count,
         max_test_name_length=max_test_name_length,
         min_budget_duration_ms=min_budget_duration_ms,
@@ -79,7 +81,7 @@ def test_flaky_detector_try_fill_metrics_from_report() -> None:
 
     detector = InitializedFlakyDetector()
     detector._context = _make_flaky_detection_context(max_test_name_length=100)
-    detector._tests_to_process = ["foo"]
+    detector._tests_to_process = {"foo"}
 
     plugin = pytest_mergify.PytestMergify()
     plugin.mergify_ci = pytest_mergify.ci_insights.MergifyCIInsights()
@@ -107,7 +109,7 @@ def test_flaky_detector_try_fill_metrics_from_report() -> None:
 def test_flaky_detector_count_remaining_tests() -> None:
     detector = InitializedFlakyDetector()
     detector.mode = "new"
-    detector._tests_to_process = ["foo", "bar", "baz"]
+    detector._tests_to_process = {"foo", "bar", "baz"}
     detector._test_metrics = {
         "foo": flaky_detection._TestMetrics(
             deadline=datetime.datetime.now(datetime.timezone.utc)
@@ -234,6 +236,18 @@ def test_flaky_detector_to_serializable_metrics() -> None:
     assert result["debug_logs"][0]["message"] == "test log"
 
 
+@pytest.mark.parametrize("debug", [False, True])
+def test_flaky_detector_debug_logs_are_only_kept_in_debug(debug: bool) -> None:
+    detector = InitializedFlakyDetector()
+    detector._context = _make_flaky_detection_context(max_test_execution_count=5)
+    detector._debug = debug
+    detector._test_metrics = {"test_foo": flaky_detection._TestMetrics()}
+
+    detector._reached_rerun_limit("test_foo")
+
+    assert len(detector._debug_logs) == (1 if debug else 0)
+
+
 def test_flaky_detector_from_context() -> None:
     context_dict = {
         "budget_ratio_for_new_tests": 0.1,
@@ -257,7 +271,7 @@ def test_flaky_detector_from_context() -> None:
     assert detector._context.existing_tests_mean_duration_ms == 5000
     assert detector._context.max_test_execution_count == 100
     assert detector._test_metrics == {}
-    assert detector._tests_to_process == []
+    assert detector._tests_to_process == set()
 
 
 def test_make_report_from_aggregated() -> None:
@@ -309,7 +323,7 @@ def test_flaky_detector_set_test_deadline_static() -> None:
     detector._is_xdist = True
     detector._context = _make_flaky_detection_context()
     detector._available_budget_duration = datetime.timedelta(seconds=10)
-    detector._tests_to_process = ["foo", "bar"]
+    detector._tests_to_process = {"foo", "bar"}
     detector._test_metrics = {
         "foo": flaky_detection._TestMetrics(),
     }
@@ -1,8 +1,11 @@
 import _pytest.config
 import pytest
 from _pytest.pytester import Pytester
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace import export
 
 import pytest_mergify
+from pytest_mergify import ci_insights
 from tests import conftest
 
 
@@ -115,13 +118,15 @@ def test_with_token_gha(
             assert True
         """
     )
-    result = pytester.runpytest_subprocess()
+    plugin = pytest_mergify.PytestMergify()
+    result = pytester.runpytest_inprocess(plugins=[plugin])
     result.assert_outcomes(passed=1)
     for line in result.stdout.lines:
         if line.startswith("MERGIFY_TEST_RUN_ID="):
             _, test_run_id = line.split("=", 2)
             assert len(test_run_id) == 16
             assert len(bytes.fromhex(test_run_id)) == 8
+            assert test_run_id == plugin.mergify_ci.test_run_id
             break
     else:
         pytest.fail("No trace id found")
@@ -238,3 +243,82 @@ def test_errors_logs_403(
         line.startswith("::notice title=Mergify CI::MERGIFY_TEST_RUN_ID=")
         for line in result.stdout.lines
     )
+
+
+@pytest.fixture
+def upload_environment(monkeypatch: pytest.MonkeyPatch, http_server: str) -> None:
+    # Uploads through the OTLP exporter to a local server: the debug console
+    # exporter would bypass what these tests patch.
+    monkeypatch.delenv("PYTEST_MERGIFY_DEBUG", raising=False)
+    monkeypatch.setenv("CI", "1")
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    monkeypatch.setenv("GITHUB_REPOSITORY", "Mergifyio/pytest-mergify")
+    monkeypatch.setenv("MERGIFY_TOKEN", "foobar")
+    monkeypatch.setenv("MERGIFY_API_URL", http_server)
+
+
+@pytest.mark.usefixtures("upload_environment")
+def test_upload_timeout_logs(
+    pytester: Pytester,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    force_flush = ci_insights.SynchronousBatchSpanProcessor.force_flush
+    monkeypatch.setattr(
+        ci_insights.SynchronousBatchSpanProcessor,
+        "force_flush",
+        lambda self, timeout_millis=30_000: force_flush(self, timeout_millis=0),
+    )
+    pytester.makepyfile(
+        """
+        def test_foo():
+            assert True
+        """
+    )
+
+    result = pytester.runpytest_inprocess(plugins=[pytest_mergify.PytestMergify()])
+    result.assert_outcomes(passed=1)
+    assert (
+        "Uploading the test results to Mergify timed out; 2 of 2 spans may be lost"
+        in result.stdout.lines
+    )
+    assert not any(
+        line.startswith("Mergify's API did not accept") for line in result.stdout.lines
+    )
+
+
+@pytest.mark.usefixtures("upload_environment")
+def test_partial_upload_logs(
+    pytester: Pytester,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # One span per batch, and only the first batch is accepted.
+    init = ci_insights.SynchronousBatchSpanProcessor.__init__
+    monkeypatch.setattr(
+        ci_insights.SynchronousBatchSpanProcessor,
+        "__init__",
+        lambda self, exporter: init(self, exporter, max_export_batch_size=1),
+    )
+    results = iter([export.SpanExportResult.SUCCESS])
+    monkeypatch.setattr(
+        OTLPSpanExporter,
+        "export",
+        lambda self, spans: next(results, export.SpanExportResult.FAILURE),
+    )
+    pytester.makepyfile(
+        """
+        def test_foo():
+            assert True
+        """
+    )
+
+    plugin = pytest_mergify.PytestMergify()
+    result = pytester.runpytest_inprocess(plugins=[plugin])
+    result.assert_outcomes(passed=1)
+    assert f"MERGIFY_TEST_RUN_ID={plugin.mergify_ci.test_run_id}" in result.stdout.lines
+    assert (
+        "Mergify's API only accepted 1 of 2 spans; the uploaded test results are incomplete"
+        in result.stdout.lines
+    )
+    assert not any(
+        line.startswith("Mergify's API did not accept") for line in result.stdout.lines
+    )
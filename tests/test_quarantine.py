@@ -1,10 +1,16 @@
+import http.server
+import json
+import threading
 import typing
+from unittest import mock
 
 import pytest
 import responses
 import requests
 
+from pytest_mergify import utils
 from pytest_mergify.quarantine import Quarantine
+from tests import conftest
 
 
 @responses.activate
@@ -31,6 +37,79 @@ def test_quarantine_handles_requests_exception(monkeypatch: pytest.MonkeyPatch)
     assert q.quarantined_tests == []
 
 
+@responses.activate
+def test_quarantine_retries_a_gateway_error() -> None:
+    url = "https://example.com/v1/ci/owner/repositories/repo/quarantines"
+    responses.add(responses.GET, url, status=503)
+    responses.add(
+        responses.GET, url, json={"quarantined_tests": [{"test_name": "test_a"}]}
+    )
+
+    q = Quarantine(
+        api_url="https://example.com",
+        token="tok",
+        repo_name="owner/repo",
+        branch_name="main",
+    )
+
+    assert q.init_error_msg is None
+    assert q.quarantined_tests == ["test_a"]
+    assert len(responses.calls) == 2
+
+
+class _GatewayErrorThenOKHandler(http.server.BaseHTTPRequestHandler):
+    statuses: typing.List[int] = []
+
+    def do_GET(self) -> None:
+        status = self.statuses.pop(0)
+        self.send_response(status)
+        if status == 503:
+            self.send_header("Retry-After", "600")
+            self.end_headers()
+            return
+
+        body = json.dumps({"quarantined_tests": [{"test_name": "test_a"}]})
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def test_quarantine_ignores_retry_after_on_a_gateway_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # `responses` never sleeps between retries, so this goes through urllib3
+    # against a real server. The API session only retries over HTTPS: its
+    # adapter is lent to plain HTTP for the duration of the test.
+    session = utils.api_session()
+    monkeypatch.setitem(session.adapters, "http://", session.get_adapter("https://"))
+    monkeypatch.setattr(_GatewayErrorThenOKHandler, "statuses", [503, 200])
+
+    with conftest._ThreadingServer(
+        ("127.0.0.1", 0), _GatewayErrorThenOKHandler
+    ) as httpd:
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with mock.patch("time.sleep") as sleep:
+                q = Quarantine(
+                    api_url=f"http://127.0.0.1:{httpd.server_address[1]}",
+                    token="tok",
+                    repo_name="owner/repo",
+                    branch_name="main",
+                )
+        finally:
+            httpd.shutdown()
+
+    assert q.init_error_msg is None
+    assert q.quarantined_tests == ["test_a"]
+    # Only the short backoff, if any: never the ten minutes the API asked for.
+    assert all(call.args[0] < 1 for call in sleep.call_args_list)
+
+
 @responses.activate
 def test_quarantine_walks_paginated_pages() -> None:
     base_url = "https://example.com/v1/ci/owner/repositories/repo/quarantines"
@@ -1,4 +1,3 @@
-import re
 import typing
 from unittest import mock
 
@@ -14,8 +13,9 @@ def test_span_resources_attributes_ci(
 ) -> None:
     result, spans = pytester_with_spans()
     assert spans is not None
+    provider = utils.get_ci_provider()
     assert all(
-        span.resource.attributes["cicd.provider.name"] == utils.get_ci_provider()
+        span.resource.attributes["cicd.provider.name"] == provider
         for span in spans.values()
     )
 
@@ -26,10 +26,7 @@ def test_span_resources_attributes_pytest(
     result, spans = pytester_with_spans()
     assert spans is not None
     assert all(
-        re.match(
-            r"\d\.",
-            typing.cast(str, span.resource.attributes["test.framework.version"]),
-        )
+        span.resource.attributes["test.framework.version"] == pytest.__version__
         for span in spans.values()
     )
 
@@ -143,6 +140,72 @@ def test_span_jenkins(
     )
 
 
+def test_span_jenkins_falls_back_to_git(
+    monkeypatch: pytest.MonkeyPatch,
+    pytester_with_spans: conftest.PytesterWithSpanT,
+) -> None:
+    monkeypatch.setenv("GITHUB_ACTIONS", "false")
+    monkeypatch.setenv("JENKINS_URL", "https://jenkins.example.com")
+    monkeypatch.setenv("JOB_NAME", "jenkins-job-name")
+    monkeypatch.setenv("GIT_URL", "https://github.com/Mergifyio/pytest-mergify")
+    monkeypatch.setenv("GIT_BRANCH", "origin/main")
+    monkeypatch.delenv("GIT_COMMIT", raising=False)
+
+    def git(*args: str) -> typing.Optional[str]:
+        if args == ("rev-parse", "HEAD"):
+            return "1860cf377dd5610e256ff52e47cf38816cc04549"
+        return None
+
+    with mock.patch("pytest_mergify.utils.git", side_effect=git):
+        result, spans = pytester_with_spans()
+
+    assert spans is not None
+    assert all(
+        span.resource.attributes["vcs.ref.head.revision"]
+        == "1860cf377dd5610e256ff52e47cf38816cc04549"
+        for span in spans.values()
+    )
+    assert all(
+        span.resource.attributes["vcs.ref.head.name"] == "main"
+        for span in spans.values()
+    )
+
+
+def test_span_buildkite_falls_back_to_git(
+    monkeypatch: pytest.MonkeyPatch,
+    pytester_with_spans: conftest.PytesterWithSpanT,
+) -> None:
+    monkeypatch.setenv("GITHUB_ACTIONS", "false")
+    monkeypatch.setenv("BUILDKITE", "true")
+    monkeypatch.setenv("BUILDKITE_PIPELINE_SLUG", "pytest-mergify")
+    monkeypatch.setenv("BUILDKITE_REPO", "https://github.com/Mergifyio/pytest-mergify")
+    monkeypatch.setenv("BUILDKITE_BRANCH", "main")
+    monkeypatch.delenv("BUILDKITE_COMMIT", raising=False)
+
+    def git(*args: str) -> typing.Optional[str]:
+        if args == ("rev-parse", "HEAD"):
+            return "1860cf377dd5610e256ff52e47cf38816cc04549"
+        return None
+
+    with mock.patch("pytest_mergify.utils.git", side_effect=git):
+        result, spans = pytester_with_spans()
+
+    assert spans is not None
+    assert all(
+        span.resource.attributes["vcs.ref.head.revision"]
+        == "1860cf377dd5610e256ff52e47cf38816cc04549"
+        for span in spans.values()
+    )
+    assert all(
+        span.resource.attributes["vcs.ref.head.name"] == "main"
+        for span in spans.values()
+    )
+    assert all(
+        span.resource.attributes["cicd.provider.name"] == "buildkite"
+        for span in spans.values()
+    )
+
+
 @mock.patch("pytest_mergify.utils.git", return_value=None)
 def test_span_circleci(
     git: mock.Mock,
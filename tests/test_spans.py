@@ -1,5 +1,6 @@
 import opentelemetry.trace
 import anys
+from opentelemetry.sdk.trace import ReadableSpan
 from opentelemetry.semconv.trace import SpanAttributes
 
 import pytest
@@ -7,12 +8,18 @@ import pytest
 from tests import conftest
 
 
+def _assert_child_of(span: ReadableSpan, parent: ReadableSpan) -> None:
+    assert parent.context is not None
+    assert span.parent is not None
+    assert span.parent.span_id == parent.context.span_id
+
+
 def test_span(
     pytester_with_spans: conftest.PytesterWithSpanT,
 ) -> None:
     result, spans = pytester_with_spans()
     assert spans is not None
-    assert set(spans.keys()) == {
+    assert spans.keys() == {
         "pytest session start",
         "test_span.py::test_pass",
     }
@@ -80,10 +87,20 @@ def test_test(
         spans["test_test.py::test_pass"].status.status_code
         == opentelemetry.trace.StatusCode.OK
     )
-    assert session_span.context is not None
-    assert spans["test_test.py::test_pass"].parent is not None
-    assert (
-        spans["test_test.py::test_pass"].parent.span_id == session_span.context.span_id
+    _assert_child_of(spans["test_test.py::test_pass"], session_span)
+
+
+def test_test_code_file_path_is_absolute(
+    pytester_with_spans: conftest.PytesterWithSpanT,
+    pytester: pytest.Pytester,
+) -> None:
+    result, spans = pytester_with_spans()
+    assert spans is not None
+
+    attributes = spans["test_test_code_file_path_is_absolute.py::test_pass"].attributes
+    assert attributes is not None
+    assert attributes["code.file.path"] == str(
+        pytester.path / "test_test_code_file_path_is_absolute.py"
     )
 
 
@@ -120,12 +137,50 @@ test_test_failure.py:1: AssertionError""",
         spans["test_test_failure.py::test_error"].status.description
         == "<class 'AssertionError'>: foobar\nassert False"
     )
-    assert session_span.context is not None
-    assert spans["test_test_failure.py::test_error"].parent is not None
-    assert (
-        spans["test_test_failure.py::test_error"].parent.span_id
-        == session_span.context.span_id
+    _assert_child_of(spans["test_test_failure.py::test_error"], session_span)
+
+
+def test_test_failure_with_a_huge_report(
+    pytester_with_spans: conftest.PytesterWithSpanT,
+) -> None:
+    result, spans = pytester_with_spans(
+        "def test_error(): assert False, 'x' * 1_000_000"
     )
+    assert spans is not None
+
+    attributes = spans["test_test_failure_with_a_huge_report.py::test_error"].attributes
+    assert attributes is not None
+    stacktrace = attributes[SpanAttributes.EXCEPTION_STACKTRACE]
+    assert isinstance(stacktrace, str)
+    assert stacktrace.startswith("[truncated]\n")
+    assert len(stacktrace) == len("[truncated]\n") + 64 * 1024
+    assert stacktrace.endswith(
+        "test_test_failure_with_a_huge_report.py:1: AssertionError"
+    )
+
+
+def test_test_failure_with_an_instrumented_test(
+    pytester_with_spans: conftest.PytesterWithSpanT,
+) -> None:
+    # The test leaves a span of its own in the context, as instrumented code
+    # under test may; the failure must still land on the test's span.
+    result, spans = pytester_with_spans("""
+import opentelemetry.context
+import opentelemetry.trace
+
+def test_error():
+    opentelemetry.context.attach(
+        opentelemetry.trace.set_span_in_context(opentelemetry.trace.INVALID_SPAN)
+    )
+    assert False, 'foobar'
+""")
+    assert spans is not None
+
+    test_span = spans["test_test_failure_with_an_instrumented_test.py::test_error"]
+    assert test_span.attributes is not None
+    assert test_span.attributes["test.case.result.status"] == "failed"
+    assert test_span.attributes[SpanAttributes.EXCEPTION_TYPE] == "AssertionError"
+    assert test_span.status.status_code == opentelemetry.trace.StatusCode.ERROR
 
 
 def test_test_skipped(
@@ -154,60 +209,51 @@ def test_skipped():
         spans["test_test_skipped.py::test_skipped"].status.status_code
         == opentelemetry.trace.StatusCode.OK
     )
-    assert session_span.context is not None
-    assert spans["test_test_skipped.py::test_skipped"].parent is not None
-    assert (
-        spans["test_test_skipped.py::test_skipped"].parent.span_id
-        == session_span.context.span_id
-    )
+    _assert_child_of(spans["test_test_skipped.py::test_skipped"], session_span)
 
 
-@pytest.mark.parametrize(
-    "mark",
-    [
-        "skip",
-        "skipif(True, reason='not needed')",
-        "skipif(1 + 1, reason='with eval')",
-        "skipif('1 + 1', reason='as str')",
-        "skipif('sys.version_info.major > 1', reason='not needed')",
-        "skipif(condition=True, reason='as kwarg')",
-        "skipif(reason='unconditional')",
-    ],
+_SKIP_MARKS = (
+    "skip",
+    "skipif(True, reason='not needed')",
+    "skipif(1 + 1, reason='with eval')",
+    "skipif('1 + 1', reason='as str')",
+    "skipif('sys.version_info.major > 1', reason='not needed')",
+    "skipif(condition=True, reason='as kwarg')",
+    "skipif(reason='unconditional')",
 )
+
+
 def test_mark_skipped(
-    mark: str,
     pytester_with_spans: conftest.PytesterWithSpanT,
 ) -> None:
-    result, spans = pytester_with_spans(f"""
-import pytest
-@pytest.mark.{mark}
-def test_skipped():
-    assert False
-""")
+    # One session for every mark: each test is three lines long, so the
+    # decorator of the n-th one sits on line 1 + 3n.
+    result, spans = pytester_with_spans(
+        "import pytest\n"
+        + "".join(
+            f"@pytest.mark.{mark}\ndef test_skipped_{i}():\n    assert False\n"
+            for i, mark in enumerate(_SKIP_MARKS)
+        )
+    )
+    result.assert_outcomes(skipped=len(_SKIP_MARKS))
     assert spans is not None
     session_span = spans["pytest session start"]
 
-    assert spans["test_mark_skipped.py::test_skipped"].attributes == {
-        "test.case.result.status": "skipped",
-        "test.scope": "case",
-        "code.function": "test_skipped",
-        "code.lineno": 1,
-        "code.filepath": "test_mark_skipped.py",
-        "code.namespace": "",
-        "code.file.path": anys.ANY_STR,
-        "code.line.number": 1,
-        "cicd.test.quarantined": False,
-    }
-    assert (
-        spans["test_mark_skipped.py::test_skipped"].status.status_code
-        == opentelemetry.trace.StatusCode.UNSET
-    )
-    assert session_span.context is not None
-    assert spans["test_mark_skipped.py::test_skipped"].parent is not None
-    assert (
-        spans["test_mark_skipped.py::test_skipped"].parent.span_id
-        == session_span.context.span_id
-    )
+    for i, mark in enumerate(_SKIP_MARKS):
+        span = spans[f"test_mark_skipped.py::test_skipped_{i}"]
+        assert span.attributes == {
+            "test.case.result.status": "skipped",
+            "test.scope": "case",
+            "code.function": f"test_skipped_{i}",
+            "code.lineno": 1 + 3 * i,
+            "code.filepath": "test_mark_skipped.py",
+            "code.namespace": "",
+            "code.file.path": anys.ANY_STR,
+            "code.line.number": 1 + 3 * i,
+            "cicd.test.quarantined": False,
+        }, mark
+        assert span.status.status_code == opentelemetry.trace.StatusCode.UNSET, mark
+        _assert_child_of(span, session_span)
 
 
 def test_mark_skipped_by_an_outer_mark(
@@ -309,12 +355,7 @@ def test_not_skipped():
         spans["test_mark_not_skipped.py::test_not_skipped"].status.status_code
         == opentelemetry.trace.StatusCode.OK
     )
-    assert session_span.context is not None
-    assert spans["test_mark_not_skipped.py::test_not_skipped"].parent is not None
-    assert (
-        spans["test_mark_not_skipped.py::test_not_skipped"].parent.span_id
-        == session_span.context.span_id
-    )
+    _assert_child_of(spans["test_mark_not_skipped.py::test_not_skipped"], session_span)
 
 
 def test_span_attributes_namespace(
@@ -327,6 +368,10 @@ class TestClassBasic:
     def test_namespace(self):
         assert True
 
+class Testtest:
+    def test(self):
+        assert True
+
 def test_namespace():
     assert True
 
@@ -342,6 +387,19 @@ def test_parametrized(hello):
     assert "test_span_attributes_namespace.py::test_parametrized[foo]" in spans
     assert "test_span_attributes_namespace.py::test_parametrized[bar]" in spans
 
+    namespaces = {
+        name: (span.attributes or {}).get(SpanAttributes.CODE_NAMESPACE)
+        for name, span in spans.items()
+    }
+    assert namespaces["test_span_attributes_namespace.py::test_namespace"] == ""
+    assert (
+        namespaces["test_span_attributes_namespace.py::TestClassBasic::test_namespace"]
+        == "TestClassBasic"
+    )
+    assert namespaces["test_span_attributes_namespace.py::test_parametrized[foo]"] == ""
+    # The test's name also appears inside its class name, which must be kept.
+    assert namespaces["test_span_attributes_namespace.py::Testtest::test"] == "Testtest"
+
 
 def test_span_resources_test_run_id(
     pytester_with_spans: conftest.PytesterWithSpanT,
@@ -35,67 +35,30 @@ def test_my_very_flaky_success_test():
     )
     assert spans is not None
 
-    assert "test_spans_quarantine.py::test_my_not_flaky_success_test" in spans
-    assert (
-        spans[
-            "test_spans_quarantine.py::test_my_not_flaky_success_test"
-        ].status.status_code
-        == opentelemetry.trace.StatusCode.OK
-    )
-    assert (
-        spans["test_spans_quarantine.py::test_my_not_flaky_success_test"].attributes
-        is not None
-    )
-    assert not spans[
-        "test_spans_quarantine.py::test_my_not_flaky_success_test"
-    ].attributes["cicd.test.quarantined"]
-
-    assert "test_spans_quarantine.py::test_my_not_flaky_failure_test" in spans
-    assert (
-        spans["test_spans_quarantine.py::test_my_not_flaky_failure_test"].attributes
-        is not None
-    )
-    assert (
-        spans[
-            "test_spans_quarantine.py::test_my_not_flaky_failure_test"
-        ].status.status_code
-        == opentelemetry.trace.StatusCode.ERROR
-    )
-
-    assert not spans[
-        "test_spans_quarantine.py::test_my_not_flaky_failure_test"
-    ].attributes["cicd.test.quarantined"]
-
-    assert "test_spans_quarantine.py::test_my_very_flaky_failure_test" in spans
-    assert "test_spans_quarantine.py::test_my_very_flaky_success_test" in spans
-    assert (
-        spans["test_spans_quarantine.py::test_my_very_flaky_failure_test"].attributes
-        is not None
-    )
-    assert (
-        spans["test_spans_quarantine.py::test_my_very_flaky_success_test"].attributes
-        is not None
-    )
-    assert (
-        spans[
-            "test_spans_quarantine.py::test_my_very_flaky_failure_test"
-        ].status.status_code
-        == opentelemetry.trace.StatusCode.OK
-    )
-
-    assert spans[
-        "test_spans_quarantine.py::test_my_very_flaky_failure_test"
-    ].attributes["cicd.test.quarantined"]
-
-    assert (
-        spans[
-            "test_spans_quarantine.py::test_my_very_flaky_success_test"
-        ].status.status_code
-        == opentelemetry.trace.StatusCode.OK
-    )
-    assert spans[
-        "test_spans_quarantine.py::test_my_very_flaky_success_test"
-    ].attributes["cicd.test.quarantined"]
+    expected = {
+        "test_spans_quarantine.py::test_my_not_flaky_success_test": (
+            opentelemetry.trace.StatusCode.OK,
+            False,
+        ),
+        "test_spans_quarantine.py::test_my_not_flaky_failure_test": (
+            opentelemetry.trace.StatusCode.ERROR,
+            False,
+        ),
+        "test_spans_quarantine.py::test_my_very_flaky_failure_test": (
+            opentelemetry.trace.StatusCode.OK,
+            True,
+        ),
+        "test_spans_quarantine.py::test_my_very_flaky_success_test": (
+            opentelemetry.trace.StatusCode.OK,
+            True,
+        ),
+    }
+    assert spans.keys() >= expected.keys()
+    for name, (status_code, quarantined) in expected.items():
+        span = spans[name]
+        assert span.status.status_code == status_code, name
+        assert span.attributes is not None
+        assert span.attributes["cicd.test.quarantined"] is quarantined, name
 
     assert """🛡️ Quarantine
 - Repository: foo/bar
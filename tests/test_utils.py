@@ -1,8 +1,15 @@
 import pathlib
+import threading
 
 import pytest
+import urllib3
 
-from pytest_mergify.utils import get_repository_name_from_url, git, is_in_ci
+from pytest_mergify.utils import (
+    api_session,
+    get_repository_name_from_url,
+    git,
+    is_in_ci,
+)
 
 
 @pytest.mark.parametrize(
@@ -96,3 +103,37 @@ def test_git_without_a_git_binary(
     monkeypatch.setenv("PATH", str(tmp_path))
 
     assert git("config", "--get", "remote.origin.url") is None
+
+
+def test_api_session_retries_gateway_errors() -> None:
+    retry = api_session().get_adapter("https://api.mergify.com").max_retries
+
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("GET", 500)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        urllib3.exceptions.ConnectTimeoutError(),
+        urllib3.exceptions.ReadTimeoutError(None, "/", "Read timed out."),  # type: ignore[arg-type]
+        urllib3.exceptions.ProtocolError(),
+    ],
+)
+def test_api_session_does_not_retry_a_hung_request(error: Exception) -> None:
+    # A request timing out already cost the full timeout: retrying it would
+    # hold the session start for that long again.
+    retry = api_session().get_adapter("https://api.mergify.com").max_retries
+
+    with pytest.raises(urllib3.exceptions.MaxRetryError):
+        retry.increment(method="GET", url="/", error=error)
+
+
+def test_api_session_is_per_thread() -> None:
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(api_session()))
+    thread.start()
+    thread.join()
+
+    assert api_session() is api_session()
+    assert sessions[0] is not api_session()
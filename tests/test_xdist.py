@@ -1,8 +1,11 @@
 import datetime
 import json
+import threading
 import typing
+from unittest import mock
 
 import _pytest.pytester
+import _pytest.reports
 import pytest
 import responses
 
@@ -142,6 +145,56 @@ def test_xdist_aggregated_report() -> None:
     assert "Active for 2 new test" in report
 
 
+def test_xdist_over_length_test_reported_once() -> None:
+    """Every worker collects the over-length test, only the one running it reports it."""
+    context_dict: typing.Dict[str, typing.Any] = {
+        "budget_ratio_for_new_tests": 0.1,
+        "budget_ratio_for_unhealthy_tests": 0.05,
+        "existing_test_names": ["test_existing"],
+        "existing_tests_mean_duration_ms": 10000,
+        "unhealthy_test_names": [],
+        "max_test_execution_count": 1000,
+        "max_test_name_length": 20,
+        "min_budget_duration_ms": 4000,
+        "min_test_execution_count": 5,
+    }
+    long_name = f"test_{'a' * 20}"
+    session = mock.Mock(
+        items=[
+            mock.Mock(nodeid=nodeid, **{"get_closest_marker.return_value": None})
+            for nodeid in ("test_existing", long_name)
+        ]
+    )
+
+    controller = flaky_detection.XdistFlakyDetectionController(
+        _context_dict=context_dict, _mode="new"
+    )
+    for worker in range(4):
+        detector = flaky_detection.FlakyDetector.from_context(
+            context_dict=context_dict,
+            mode="new",
+        )
+        detector.prepare_for_session(session)
+        if worker == 0:
+            detector.try_fill_metrics_from_report(
+                _pytest.reports.TestReport(
+                    duration=0.1,
+                    keywords={},
+                    location=("", None, ""),
+                    longrepr=None,
+                    nodeid=long_name,
+                    outcome="passed",
+                    when="setup",
+                )
+            )
+        controller.collect_worker_metrics(detector.to_serializable_metrics())
+
+    report = controller.make_report()
+
+    assert "Skipped 1 test:" in report
+    assert report.count(long_name) == 1
+
+
 @responses.activate
 def test_no_crash_without_xdist(
     monkeypatch: pytest.MonkeyPatch,
@@ -262,7 +315,7 @@ def test_serialized_metrics_stay_serializable_after_timeout_prevention() -> None
     )
 
     test = "test_slow"
-    detector._tests_to_process = [test]
+    detector._tests_to_process = {test}
     detector._test_metrics[test] = flaky_detection._TestMetrics()
     detector._available_budget_duration = datetime.timedelta(seconds=100)
 
@@ -299,3 +352,31 @@ def test_worker_does_not_fetch_flaky_context(
     assert len(responses.calls) == 0
     assert insights.flaky_detector is None
     assert insights.flaky_detector_error_message is None
+
+
+@responses.activate
+def test_worker_loads_without_a_thread_pool(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """On a worker only the quarantine lookup calls the API, so nothing runs
+    in parallel and no thread is started for it."""
+    _set_test_environment(monkeypatch)
+    _make_quarantine_mock()
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+
+    threads = []
+    load_quarantine = ci_insights.MergifyCIInsights._load_quarantine
+
+    def _load_quarantine(self: ci_insights.MergifyCIInsights) -> None:
+        threads.append(threading.current_thread())
+        load_quarantine(self)
+
+    monkeypatch.setattr(
+        ci_insights.MergifyCIInsights, "_load_quarantine", _load_quarantine
+    )
+
+    insights = ci_insights.MergifyCIInsights()
+
+    assert threads == [threading.current_thread()]
+    assert insights.quarantined_tests is not None
+    assert len(responses.calls) == 1